@@ -18,20 +18,24 @@ import matplotlib.pyplot as plt
 from sklearn.metrics import mean_squared_error, r2_score
 
 
-def filter_data(X, y, y_pred, store=None, month=None):
-    """Apply store/month filters to the dataframes."""
-    df = X.copy()
-    df["Actual"] = y
-    df["Predicted"] = y_pred
+def filter_data(df, store=None, month=None):
+    """
+    Apply store/month filters to the shared results dataframe.
+
+    The input is returned as-is when no filter is active, so only the
+    selected rows are ever materialised per session.
+    """
+    mask = None
 
     # Only filter if column exists and user selected something
     if "Store" in df.columns and store and store != "All":
-        df = df[df["Store"] == store]
+        mask = df["Store"] == store
 
     if "Month" in df.columns and month and month != "All":
-        df = df[df["Month"] == month]
+        month_mask = df["Month"] == month
+        mask = month_mask if mask is None else mask & month_mask
 
-    return df
+    return df if mask is None else df[mask]
 
 
 def display_filtered_metrics(df):
@@ -40,8 +40,10 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(BASE_DIR))
 
 from utils.loaders import load_model, load_csv
+from utils.shared_data import (
+    is_stale, publish_test_frame, attach_test_frame, predictions_csv_path
+)
 
-import pandas as pd
 import matplotlib.pyplot as plt
 from sklearn.metrics import mean_squared_error, r2_score
 from app.components.feature_importance import plot_feature_importance
@@ -56,6 +58,8 @@ PLOTS_DIR = BASE_DIR / "plots"
 MODEL_PATH = DATA_DIR / "trained_model" / "rf_light_model.pkl"
 X_TEST_PATH = DATA_DIR / "test" / "X_test.csv"
 Y_TEST_PATH = DATA_DIR / "test" / "y_test.csv"
+SHARED_FRAME_PATH = DATA_DIR / "shared" / "test_frame.arrow"
+PREDICTIONS_CSV_PATH = predictions_csv_path(SHARED_FRAME_PATH)
 PREDICTION_PLOT_PATH = PLOTS_DIR / "actual_vs_predicted.png"
 
 
@@ -69,20 +73,26 @@ Filter, visualize, and interact with your data to better understand elasticity i
 """)
 
 # === Load Model & Data ===
-# === Load Model & Data ===
-@cache_resource(show_spinner="⏳ Downloading and loading model...")
-def safe_load_model():
-    return load_model(MODEL_PATH)
-
+# Test data, predictions and feature importances are published once into a
+# memory-mapped Arrow file that every session and server process attaches to.
 @cache_resource(show_spinner="📦 Loading test data...")
-def safe_load_test_data():
-    X = load_csv(X_TEST_PATH)
-    y = load_csv(Y_TEST_PATH)
-    return X, y
+def safe_load_shared_data():
+    if (is_stale(SHARED_FRAME_PATH, MODEL_PATH, X_TEST_PATH, Y_TEST_PATH)
+            or not PREDICTIONS_CSV_PATH.exists()):
+        model, _ = load_model(MODEL_PATH)
+        X = load_csv(X_TEST_PATH)
+        y = load_csv(Y_TEST_PATH)
+        publish_test_frame(
+            X, y, model.predict(X),
+            getattr(model, "feature_importances_", None),
+            SHARED_FRAME_PATH
+        )
+        # The model is only needed to publish; don't keep it resident
+        load_model.clear()
+    return attach_test_frame(SHARED_FRAME_PATH)
 
 try:
-    model, feature_names = safe_load_model()
-    X_test, y_test = safe_load_test_data()
+    results_df, importances = safe_load_shared_data()
 except Exception as e:
     st.error("❌ Failed to load model or test data.")
     st.code(str(e), language="python")
@@ -93,21 +103,22 @@ except Exception as e:
 
 
 # === Predictions & Metrics ===
-y_pred = model.predict(X_test)
+y_test = results_df["Actual"]
+y_pred = results_df["Predicted"]
 mse = mean_squared_error(y_test, y_pred)
 rmse = mse ** 0.5
 r2 = r2_score(y_test, y_pred)
 
 # === Sidebar Filters (Scaffold Only) ===
 st.sidebar.header("🔧 Filter Options")
-if "Store" in X_test.columns:
-    store_options = ["All"] + sorted(X_test["Store"].dropna().unique())
+if "Store" in results_df.columns:
+    store_options = ["All"] + sorted(results_df["Store"].dropna().unique())
     store_filter = st.sidebar.selectbox("Select Store (optional)", options=store_options)
 else:
     store_filter = "All"
 
-if "Month" in X_test.columns:
-    month_options = ["All"] + sorted(X_test["Month"].dropna().unique())
+if "Month" in results_df.columns:
+    month_options = ["All"] + sorted(results_df["Month"].dropna().unique())
     month_filter = st.sidebar.selectbox("Select Month (optional)", options=month_options)
 else:
     month_filter = "All"
@@ -121,7 +132,7 @@ with tab1:
     from app.components.filtered_results import filter_data, display_filtered_metrics
 
     # Filter based on sidebar selection
-    filtered_df = filter_data(X_test, y_test, y_pred, store_filter, month_filter)
+    filtered_df = filter_data(results_df, store_filter, month_filter)
 
     # Display metrics and plot
     display_filtered_metrics(filtered_df)
@@ -133,12 +144,6 @@ with tab2:
         st.caption("Feature importances reflect the global trained model and do not change with filters.")
         st.subheader("🔍 Feature Importances")
         try:
-            # Prepare importance DataFrame
-            importances = pd.DataFrame({
-                "feature": X_test.columns,
-                "importance": model.feature_importances_
-            })
-
             plot_feature_importance(importances)
         except Exception as e:
             st.error(f"❌ Could not plot feature importances: {e}")
@@ -147,18 +152,14 @@ with tab2:
 with tab3:
     st.subheader("📥 Download Predicted Results")
 
-    # Join predictions to X_test for convenience (placeholder logic)
-    results_df = X_test.copy()
-    results_df["Actual"] = y_test
-    results_df["Predicted"] = y_pred
-
-    csv_data = results_df.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        label="Download Predictions as CSV",
-        data=csv_data,
-        file_name="predictions.csv",
-        mime="text/csv"
-    )
+    # Served from the CSV published alongside the shared Arrow file
+    with open(PREDICTIONS_CSV_PATH, "rb") as predictions_file:
+        st.download_button(
+            label="Download Predictions as CSV",
+            data=predictions_file,
+            file_name="predictions.csv",
+            mime="text/csv"
+        )
 
 # === Footer ===
 st.caption("Part of the Elasticity Risk Exposure Project. Built with ❤️ and Streamlit.")
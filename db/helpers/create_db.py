@@ -1,6 +1,5 @@
 """db/create_db.py"""
 
-import pandas as pd
 import duckdb
 from pathlib import Path
 import os
@@ -11,11 +10,11 @@ def create_duckdb_from_csv():
     Creates a DuckDB database from processed CSV data.
 
     This function:
-    1. Reads the processed_data.csv file
-    2. Creates necessary directories if they don't exist
-    3. Establishes a connection to a DuckDB database
-    4. Creates a table in the database from the DataFrame
-    5. Validates the data was imported correctly
+    1. Creates necessary directories if they don't exist
+    2. Establishes a connection to a DuckDB database
+    3. Creates a table in the database from processed_data.csv
+       (written by scripts/clean_data.py)
+    4. Validates the data was imported correctly
     """
     # Define paths
     csv_path = Path("data/processed/processed_data.csv")
@@ -23,18 +22,18 @@ def create_duckdb_from_csv():
     # Create directory if it doesn't exist
     os.makedirs(DB_PATH.parent, exist_ok=True)
 
-    # Read the CSV data
-    print(f"Reading data from {csv_path}...")
-    df = pd.read_csv(csv_path)
-    print(f"Loaded {len(df)} rows with {len(df.columns)} columns")
-
     # Connect to DuckDB
     print(f"Creating DuckDB database at {DB_PATH}...")
     conn = duckdb.connect(str(DB_PATH))
 
-    # Create table from DataFrame
-    print("Creating 'rossmann_sales' table...")
-    conn.execute("CREATE TABLE IF NOT EXISTS rossmann_sales AS SELECT * FROM df")
+    # Load the CSV straight into DuckDB so it never has to fit in pandas.
+    # Date stays VARCHAR, matching the schema of the old pandas-based load.
+    print(f"Creating 'rossmann_sales' table from {csv_path}...")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS rossmann_sales AS "
+        "SELECT * FROM read_csv_auto(?, types = {'Date': 'VARCHAR'})",
+        [str(csv_path)]
+    )
 
     # Verify data was imported correctly
     row_count = conn.execute("SELECT COUNT(*) FROM rossmann_sales").fetchone()[0]
@@ -0,0 +1,241 @@
+"""scripts/clean_data.py
+
+Streaming cleaning pipeline for the raw Rossmann train.csv.
+
+Replaces the interactive preprocessing in
+notebooks/02_data_cleaning_and_feature_engineering.ipynb with DuckDB SQL.
+DuckDB scans the CSV in parallel chunks across all threads and spills to a
+temp directory when the data does not fit in memory, so the raw file is
+never loaded whole into pandas. The CSV is parsed exactly once into a temp
+table, from which both the stage stats and the output are produced.
+
+Stages (in order):
+1. Malformed rows        – lines with missing/extra fields or non-integer numeric
+                           values are rejected
+2. StateHoliday coercion – rows whose StateHoliday is not an integer are rejected
+3. Date parsing          – rows with an unparseable Date are rejected
+4. Closed stores         – rows with Open == 0 and Sales == 0 are dropped
+5. Dedupe                – exact duplicate rows are dropped
+
+Usage:
+    python -m scripts.clean_data
+    python -m scripts.clean_data --input data/raw/train.csv --threads 8 --memory-limit 2GB
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import duckdb
+
+# === Paths ===
+TRAIN_CSV_PATH = Path("data/raw/train.csv")
+PROCESSED_CSV_PATH = Path("data/processed/processed_data.csv")
+
+NUMERIC_COLUMNS = [
+    "Store", "DayOfWeek", "Sales", "Customers", "Open", "Promo", "SchoolHoliday"
+]
+RAW_COLUMNS = [
+    "Store", "DayOfWeek", "Date", "Sales", "Customers", "Open", "Promo",
+    "StateHoliday", "SchoolHoliday"
+]
+
+OUTPUT_COLUMNS = (
+    "Date, Store, DayOfWeek, Sales, Customers, Open, Promo, StateHoliday, SchoolHoliday"
+)
+
+# Integers only: TRY_CAST alone would round '1.6' to 2 and accept '1e3'
+INTEGER_PATTERN = "-?[0-9]+"
+
+STAGES = ["raw", "malformed", "state_holiday", "date", "closed_stores", "dedupe"]
+
+# Every raw row, parsed and tagged with the result of each stage's check.
+# All fields are read as VARCHAR and only cast when they are plain integers
+# or dates, so bad values are counted rather than aborting the scan; lines with the wrong number of fields go
+# to the 'csv_rejects' table instead.
+CHECKED_SQL = """
+    CREATE TEMP TABLE checked AS
+    WITH parsed AS (
+        SELECT
+            {numeric_casts},
+            {state_holiday_cast} AS StateHoliday,
+            TRY_CAST(Date AS DATE) AS Date,
+            {numeric_ok} AS numeric_ok
+        FROM read_csv(
+            '{input_path}',
+            header = true,
+            delim = ',',
+            quote = '"',
+            parallel = true,
+            store_rejects = true,
+            rejects_table = 'csv_rejects',
+            rejects_scan = 'csv_reject_scans',
+            columns = {{{raw_columns}}}
+        )
+    )
+    SELECT
+        *,
+        StateHoliday IS NOT NULL AS state_holiday_ok,
+        Date IS NOT NULL AS date_ok,
+        NOT COALESCE(Open = 0 AND Sales = 0, false) AS open_ok
+    FROM parsed
+"""
+
+
+def _sql_string(value) -> str:
+    """Escape a value for use inside a SQL string literal."""
+    return str(value).replace("'", "''")
+
+
+def _integer_cast(col: str) -> str:
+    """SQL expression casting a VARCHAR column to INTEGER, NULL unless it is a plain integer."""
+    return (
+        f"CASE WHEN regexp_full_match(trim({col}), '{INTEGER_PATTERN}') "
+        f"THEN TRY_CAST(trim({col}) AS INTEGER) END"
+    )
+
+
+def connect_pipeline(spill_dir: Path, threads: int = None, memory_limit: str = None):
+    """
+    Open an in-memory DuckDB connection configured for out-of-core work.
+
+    Args:
+        spill_dir: Directory used to spill intermediate data larger than memory
+        threads: Worker threads used to scan and process chunks (default: all cores)
+        memory_limit: DuckDB memory limit such as '2GB' (default: DuckDB's own)
+
+    Returns:
+        A DuckDB connection object
+    """
+    conn = duckdb.connect(":memory:")
+    conn.execute(f"SET temp_directory = '{_sql_string(spill_dir)}'")
+    conn.execute(f"SET threads = {int(threads or os.cpu_count() or 1)}")
+    if memory_limit:
+        conn.execute(f"SET memory_limit = '{_sql_string(memory_limit)}'")
+    # Output is explicitly ordered, so insertion order need not be tracked
+    conn.execute("SET preserve_insertion_order = false")
+    return conn
+
+
+def load_checked(conn, input_path: Path):
+    """Parse the raw CSV once into the 'checked' temp table."""
+    numeric_casts = ",\n            ".join(
+        f"{_integer_cast(col)} AS {col}" for col in NUMERIC_COLUMNS
+    )
+    numeric_ok = " AND ".join(
+        f"{_integer_cast(col)} IS NOT NULL" for col in NUMERIC_COLUMNS
+    )
+    raw_columns = ", ".join(f"'{col}': 'VARCHAR'" for col in RAW_COLUMNS)
+    conn.execute(CHECKED_SQL.format(
+        input_path=_sql_string(input_path),
+        numeric_casts=numeric_casts,
+        numeric_ok=numeric_ok,
+        state_holiday_cast=_integer_cast("StateHoliday"),
+        raw_columns=raw_columns,
+    ))
+
+
+def stage_counts(conn) -> dict:
+    """Return the number of rows surviving each filtering stage (before dedupe)."""
+    malformed_lines = conn.execute(
+        "SELECT COUNT(DISTINCT (scan_id, file_id, line)) FROM csv_rejects"
+    ).fetchone()[0]
+    row = conn.execute("""
+        SELECT
+            COUNT(*) FILTER (WHERE numeric_ok),
+            COUNT(*) FILTER (WHERE numeric_ok AND state_holiday_ok),
+            COUNT(*) FILTER (WHERE numeric_ok AND state_holiday_ok AND date_ok),
+            COUNT(*) FILTER (WHERE numeric_ok AND state_holiday_ok AND date_ok AND open_ok),
+            COUNT(*)
+        FROM checked
+    """).fetchone()
+    parsed_rows = row[-1]
+    return dict(zip(STAGES, (parsed_rows + malformed_lines, *row[:-1])))
+
+
+def write_cleaned(conn, output_path: Path) -> int:
+    """Write the deduplicated, date-ordered clean rows to CSV and return the row count."""
+    return conn.execute(f"""
+        COPY (
+            SELECT DISTINCT {OUTPUT_COLUMNS}
+            FROM checked
+            WHERE numeric_ok AND state_holiday_ok AND date_ok AND open_ok
+            ORDER BY Date, Store
+        ) TO '{_sql_string(output_path)}' (HEADER, DELIMITER ',')
+    """).fetchone()[0]
+
+
+def print_stage_stats(counts: dict):
+    """Print row counts and rejections per stage."""
+    print("📊 Cleaning stats:")
+    previous = None
+    for stage in STAGES:
+        rows = counts[stage]
+        rejected = 0 if previous is None else previous - rows
+        print(f"  • {stage:<14} rows: {rows:>10,}  rejected: {rejected:>10,}")
+        previous = rows
+
+
+def clean_train_csv(
+    input_path: Path = TRAIN_CSV_PATH,
+    output_path: Path = PROCESSED_CSV_PATH,
+    threads: int = None,
+    memory_limit: str = None,
+    spill_root: Path = None,
+) -> dict:
+    """
+    Clean the raw train.csv and write processed_data.csv.
+
+    Args:
+        input_path: Raw train.csv
+        output_path: Processed CSV consumed by create_duckdb_from_csv
+        threads: Worker threads (default: all cores)
+        memory_limit: DuckDB memory limit such as '2GB'
+        spill_root: Directory under which a scratch spill directory is created
+                    and removed after the run (default: next to output_path)
+
+    Returns:
+        dict: Rows surviving each stage, keyed by stage name
+    """
+    if not input_path.exists():
+        raise FileNotFoundError(f"CSV file not found: {input_path}")
+    os.makedirs(output_path.parent, exist_ok=True)
+
+    spill_root = spill_root or output_path.parent
+    os.makedirs(spill_root, exist_ok=True)
+    spill_dir = Path(tempfile.mkdtemp(prefix=".duckdb_spill_", dir=spill_root))
+
+    conn = None
+    try:
+        conn = connect_pipeline(spill_dir, threads=threads, memory_limit=memory_limit)
+        print(f"Cleaning {input_path}...")
+        load_checked(conn, input_path)
+        counts = stage_counts(conn)
+        counts["dedupe"] = write_cleaned(conn, output_path)
+    finally:
+        if conn is not None:
+            conn.close()
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+    print_stage_stats(counts)
+    print(f"✅ Wrote {counts['dedupe']:,} rows to {output_path}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Clean raw train.csv into processed_data.csv")
+    parser.add_argument("--input", type=Path, default=TRAIN_CSV_PATH, help="Raw train.csv path")
+    parser.add_argument("--output", type=Path, default=PROCESSED_CSV_PATH, help="Processed CSV path")
+    parser.add_argument("--threads", type=int, default=None, help="Worker threads (default: all cores)")
+    parser.add_argument("--memory-limit", type=str, default=None, help="DuckDB memory limit, e.g. 2GB")
+    parser.add_argument("--spill-dir", type=Path, default=None,
+                        help="Where to create the temporary spill directory (default: next to --output)")
+
+    args = parser.parse_args()
+    clean_train_csv(args.input, args.output, args.threads, args.memory_limit, args.spill_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""utils/shared_data.py
+
+Read-only data plane shared by every Streamlit session and server process.
+
+The test frame, its predictions and the model's feature importances are
+published once into an uncompressed Arrow IPC file. Each process then
+memory-maps that file, so the column buffers live in the OS page cache and
+are shared zero-copy instead of being copied per process or per session.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# === Constants ===
+IMPORTANCES_KEY = b"feature_importances"
+PREDICTIONS_CSV_NAME = "predictions.csv"
+TARGET_COLUMNS = ("Actual", "Predicted")
+
+# Narrowest dtypes that still hold the Rossmann value ranges
+DOWNCAST_DTYPES = {
+    "Store": "int16",
+    "Month": "int8",
+    "DayOfWeek": "int8",
+}
+
+
+# === Dtype Handling ===
+def _fits_integer_dtype(series: pd.Series, dtype: str) -> bool:
+    """Return True if every value is a whole number within the bounds of dtype."""
+    if pd.api.types.is_bool_dtype(series) or not pd.api.types.is_numeric_dtype(series):
+        return False
+    if series.isna().any():
+        return False
+    if pd.api.types.is_float_dtype(series) and not (series % 1 == 0).all():
+        return False
+    bounds = np.iinfo(dtype)
+    return series.empty or (series.min() >= bounds.min and series.max() <= bounds.max)
+
+
+def downcast_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcast columns to compact dtypes (int16 Store, int8 Month/DayOfWeek, float32 values).
+
+    Columns in DOWNCAST_DTYPES whose values don't fit the target dtype keep
+    the generic float32 / smallest-integer handling instead of wrapping.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if col in DOWNCAST_DTYPES and _fits_integer_dtype(series, DOWNCAST_DTYPES[col]):
+            columns[col] = series.astype(DOWNCAST_DTYPES[col])
+        elif pd.api.types.is_float_dtype(series):
+            columns[col] = series.astype("float32")
+        elif pd.api.types.is_integer_dtype(series):
+            columns[col] = pd.to_numeric(series, downcast="integer")
+        else:
+            columns[col] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+# === Publishing ===
+def is_stale(shared_path: Path, *sources: Path) -> bool:
+    """Return True if the shared file is missing or older than any existing source."""
+    if not shared_path.exists():
+        return True
+    published_at = shared_path.stat().st_mtime
+    return any(src.exists() and src.stat().st_mtime > published_at for src in sources)
+
+
+def _write_atomically(path: Path, write):
+    """
+    Call write(tmp_path) on a private temp file and rename it over path.
+
+    Concurrent server processes therefore never see a half-written file, and
+    the temp file is removed if writing or renaming fails.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def predictions_csv_path(shared_path: Path) -> Path:
+    """Return the path of the predictions CSV published next to the shared file."""
+    return shared_path.with_name(PREDICTIONS_CSV_NAME)
+
+
+def publish_test_frame(X: pd.DataFrame, y, y_pred, feature_importances, shared_path: Path):
+    """
+    Write the test features, actuals and predictions to a shared Arrow IPC file,
+    plus the same rows as predictions.csv next to it for download.
+
+    Parameters:
+    - X: Test features
+    - y: Actual target values (Series or single-column DataFrame)
+    - y_pred: Model predictions aligned with X
+    - feature_importances: Per-feature importances, or None if the model has none
+    - shared_path: Destination of the Arrow IPC file
+    """
+    frame = downcast_frame(X.reset_index(drop=True))
+    actual = y.iloc[:, 0] if isinstance(y, pd.DataFrame) else y
+    frame["Actual"] = np.asarray(actual, dtype="float32")
+    frame["Predicted"] = np.asarray(y_pred, dtype="float32")
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    if feature_importances is not None:
+        metadata = dict(table.schema.metadata or {})
+        metadata[IMPORTANCES_KEY] = json.dumps({
+            "feature": list(X.columns),
+            "importance": [float(v) for v in feature_importances],
+        }).encode("utf-8")
+        table = table.replace_schema_metadata(metadata)
+
+    def write_arrow(tmp_path):
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    # The CSV goes first, so a published Arrow file always has a matching CSV
+    _write_atomically(
+        predictions_csv_path(shared_path),
+        lambda tmp_path: frame.to_csv(tmp_path, index=False)
+    )
+    _write_atomically(shared_path, write_arrow)
+
+
+# === Attaching ===
+def attach_test_frame(shared_path: Path):
+    """
+    Memory-map the shared Arrow IPC file.
+
+    Returns:
+        tuple: (results_df, importances_df) where results_df holds the features
+        plus 'Actual' and 'Predicted' backed by read-only mapped buffers, and
+        importances_df has 'feature' and 'importance' columns (empty if the
+        model exposed no importances).
+    """
+    if not shared_path.exists():
+        raise FileNotFoundError(f"Shared data file not found: {shared_path}")
+
+    source = pa.memory_map(str(shared_path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks keeps one block per column so pandas can wrap the mapped
+    # buffers directly instead of consolidating them into fresh arrays
+    results_df = table.to_pandas(split_blocks=True)
+
+    raw_importances = (table.schema.metadata or {}).get(IMPORTANCES_KEY)
+    if raw_importances is None:
+        importances_df = pd.DataFrame(columns=["feature", "importance"])
+    else:
+        importances_df = pd.DataFrame(json.loads(raw_importances.decode("utf-8")))
+    return results_df, importances_df